@@ -7,79 +7,111 @@ Clean Video Transcriber using OpenAI Whisper API
 - Drag & drop support
 """
 
+import operator
 import os
 import sys
-import json
 import re
 import subprocess
 import tempfile
 from pathlib import Path
-from typing import List, Tuple
-from openai import OpenAI
-from moviepy.editor import VideoFileClip
-from dotenv import load_dotenv
+from typing import List, Tuple, Union
+import numpy as np
+from video_utils import (
+    run_ffmpeg, extract_audio_mp3, read_json, write_json, merge_intervals, invert_intervals,
+    concat_list, reencode_keeps,
+)
 
-# Load environment variables
-load_dotenv()
-
-# Filler word detection patterns
+# Filler word detection patterns, merged on shared prefixes so each branch is
+# rejected on its first characters instead of trying every alternative in turn
 FILLER_PATTERNS = [
-    r"\buh+\b", r"\bum+\b", r"\berm?\b", r"\ber+\b",
-    r"\blike\b", r"\bactually\b", r"\bbasically\b", r"\bliterally\b",
-    r"\bkinda\b", r"\bsorta\b", r"\bright\b",
-    r"\byou know\b", r"\bi mean\b", r"\bkind of\b", r"\bsort of\b",
+    r"u(?:h+|m+)", r"er(?:m|r*)",
+    r"li(?:ke|terally)", r"actually", r"basically",
+    r"(?:kind|sort)(?:a| of)", r"right",
+    r"you know", r"i mean",
 ]
 
-_filler_re = re.compile("|".join(FILLER_PATTERNS), re.IGNORECASE)
+# anchored per line, for scanning a newline-joined transcript in one pass
+# (the line anchors already imply the word boundaries)
+_filler_line_re = re.compile(r"^(?:" + "|".join(FILLER_PATTERNS) + r")$", re.IGNORECASE | re.MULTILINE)
+# case-sensitive twin for an already lowercased buffer, which scans about twice as fast
+_filler_line_lower_re = re.compile(_filler_line_re.pattern, re.MULTILINE)
+# the only characters IGNORECASE equates with an ASCII letter that str.lower() does not
+# turn into it, so meeting one means falling back to the case-insensitive scan
+_CASEFOLD_ONLY = ("İ", "ı", "ſ")
 
-def detect_filler_word_ids(words: list) -> List[int]:
-    """Return indices (0-based) of words that look like fillers."""
-    ids = []
-    for i, w in enumerate(words):
-        txt = (w.get("word") or w.get("text") or "").strip()
-        if _filler_re.fullmatch(txt):
-            # light heuristic: treat 'like' as filler only if short (<0.35s)
-            dur = float(w["end"]) - float(w["start"])
-            if txt.lower() == "like" and dur > 0.35:
-                continue
-            ids.append(i)
-    return ids
+def word_texts(words: list) -> List[str]:
+    """Return the stripped text of each word dict."""
+    return [(w.get("word") or w.get("text") or "").strip() for w in words]
 
-def merge_intervals(intervals: List[Tuple[float,float]]) -> List[Tuple[float,float]]:
-    """Merge overlapping [start,end] intervals in seconds."""
-    if not intervals: 
-        return []
-    intervals = sorted(intervals)
-    merged = [intervals[0]]
-    for s,e in intervals[1:]:
-        last_s,last_e = merged[-1]
-        if s <= last_e:
-            merged[-1] = (last_s, max(last_e, e))
-        else:
-            merged.append((s,e))
-    return merged
+def word_columns(words: list) -> Tuple[List[str], np.ndarray, np.ndarray]:
+    """Split word dicts into parallel (text, start, end) columns."""
+    starts = np.fromiter(map(operator.itemgetter("start"), words), dtype=float, count=len(words))
+    ends = np.fromiter(map(operator.itemgetter("end"), words), dtype=float, count=len(words))
+    return word_texts(words), starts, ends
 
-def invert_intervals(removes: List[Tuple[float,float]], duration_s: float) -> List[Tuple[float,float]]:
-    """Return keep ranges by inverting removes over [0, duration]."""
-    keeps = []
-    cursor = 0.0
-    for s,e in removes:
-        s = max(0.0, s)
-        e = min(duration_s, e)
-        if s > cursor:
-            keeps.append((cursor, s))
-        cursor = max(cursor, e)
-    if cursor < duration_s:
-        keeps.append((cursor, duration_s))
-    # strip zero/negative segments
-    return [(s,e) for (s,e) in keeps if e - s > 0.01]
+def detect_filler_word_ids(texts: List[str], word_spans) -> List[int]:
+    """Return indices (0-based) of words that look like fillers.
+    
+    word_spans(ids) returns the (starts, ends) arrays of the given word ids; it is
+    only asked for the 'like' matches, so no timing column is built for the scan.
+    """
+    if not texts:
+        return []
+    
+    # one regex scan over all tokens, one per line, instead of a fullmatch call per word
+    buf = "\n".join(texts)
+    if buf.count("\n") >= len(texts):
+        # a newline inside a token would shift every later line; no filler contains '\r',
+        # so swapping it in keeps those tokens unmatched
+        buf = "\n".join(t.replace("\n", "\r") for t in texts)
+    if any(c in buf for c in _CASEFOLD_ONLY):
+        matches = _filler_line_re.finditer(buf)
+    else:
+        buf = buf.lower()
+        matches = _filler_line_lower_re.finditer(buf)
+    
+    ids = []
+    like_ids = []
+    line = pos = 0
+    for m in matches:
+        # each match is a whole line, so its word id is the number of newlines before it
+        line += buf.count("\n", pos, m.start())
+        pos = m.start()
+        ids.append(line)
+        if m.group().lower() == "like":
+            like_ids.append(line)
+    
+    # light heuristic: treat 'like' as filler only if short (<0.35s)
+    if like_ids:
+        starts, ends = word_spans(like_ids)
+        long_likes = set(np.asarray(like_ids)[ends - starts > 0.35].tolist())
+        ids = [i for i in ids if i not in long_likes]
+    return ids
 
 class VideoTranscriber:
     def __init__(self):
+        self.read_settings()
+        self.client = None
+        
+        # word texts and timings of the last words file loaded, keyed by (path, mtime)
+        self._words_key = None
+        self._words = None
+        
+    def read_settings(self):
+        """Read API key, model and size limit from the environment"""
         self.api_key = os.getenv('OPENAI_API_KEY')
         self.model = os.getenv('DEFAULT_MODEL', 'whisper-1')
         self.max_file_size = int(os.getenv('MAX_FILE_SIZE_MB', 25)) * 1024 * 1024
         
+    def connect(self):
+        """Load .env and create the OpenAI client"""
+        # imported here so the cleaning commands start without loading them
+        from dotenv import load_dotenv
+        from openai import OpenAI
+        
+        load_dotenv()
+        self.read_settings()  # pick up values that only live in .env
+        
         if not self.api_key:
             print("Error: OPENAI_API_KEY not found in .env file")
             print("Make sure you have a .env file with your API key")
@@ -129,47 +161,29 @@ class VideoTranscriber:
         print("Extracting audio from video...")
         
         try:
-            video = VideoFileClip(str(video_path))
-            
-            # Create temp audio file
-            audio_path = video_path.with_suffix('.temp.mp3')
-            
-            # Extract audio
-            video.audio.write_audiofile(
-                str(audio_path), 
-                verbose=False, 
-                logger=None
-            )
-            
-            video.close()
-            return audio_path
+            return extract_audio_mp3(video_path)
             
         except Exception as e:
             print(f"Error extracting audio: {e}")
             return None
     
-    def transcribe_audio(self, audio_path):
+    def transcribe_audio(self, audio):
         """Transcribe audio using OpenAI Whisper API"""
         print("Transcribing with OpenAI Whisper...")
         
         try:
-            with open(audio_path, "rb") as audio_file:
-                transcript = self.client.audio.transcriptions.create(
-                    model=self.model,
-                    file=audio_file,
-                    response_format="verbose_json",
-                    timestamp_granularities=["word"]
-                )
+            transcript = self.client.audio.transcriptions.create(
+                model=self.model,
+                file=audio,
+                response_format="verbose_json",
+                timestamp_granularities=["word"]
+            )
             
             return transcript
             
         except Exception as e:
             print(f"Transcription failed: {e}")
             return None
-        finally:
-            # Clean up temp audio file
-            if audio_path.exists():
-                audio_path.unlink()
     
     def save_results(self, video_path, transcript):
         """Save transcript and word data"""
@@ -182,7 +196,6 @@ class VideoTranscriber:
         
         # Save word-level data as JSON
         if hasattr(transcript, 'words') and transcript.words:
-            import json
             words_file = video_path.parent / f"{base_name}_words.json"
             
             words_data = []
@@ -193,8 +206,12 @@ class VideoTranscriber:
                     'end': word.end
                 })
             
-            with open(words_file, 'w', encoding='utf-8') as f:
-                json.dump(words_data, f, indent=2)
+            write_json(words_file, words_data)
+            
+            # Save the same words as columns for the cleaning commands
+            texts, starts, ends = word_columns(words_data)
+            np.savez(words_file.with_suffix('.npz'), text=np.array(texts, dtype=str),
+                     start=starts.astype(np.float32), end=ends.astype(np.float32))
                 
             print(f"Saved transcript: {transcript_file}")
             print(f"Saved word data: {words_file}")
@@ -234,6 +251,7 @@ class VideoTranscriber:
         print("Clean Video Transcriber")
         print("=" * 50)
         
+        self.connect()
 
         video_path = self.get_video_file()
         
@@ -244,12 +262,12 @@ class VideoTranscriber:
         print(f"\nProcessing: {video_path.name}")
         
         # Extract audio
-        audio_path = self.extract_audio(video_path)
-        if not audio_path:
+        audio = self.extract_audio(video_path)
+        if not audio:
             return
         
         # Transcribe
-        transcript = self.transcribe_audio(audio_path)
+        transcript = self.transcribe_audio(audio)
         if not transcript:
             return
         
@@ -260,17 +278,58 @@ class VideoTranscriber:
         print(f"\nDone! Check the files next to {video_path.name}")
     
     def build_remove_intervals(self, words_path: Path, word_ids_to_remove: List[int],
-                               pad_before_ms=120, pad_after_ms=150) -> List[Tuple[float,float]]:
+                               pad_before_ms=120, pad_after_ms=150) -> Union[List[Tuple[float,float]], np.ndarray]:
         """Build time intervals to remove based on word IDs"""
-        words = json.loads(words_path.read_text(encoding="utf-8"))
-        removes = []
-        for idx in word_ids_to_remove:
-            if 0 <= idx < len(words):
-                w = words[idx]
-                s = float(w["start"]) - (pad_before_ms/1000.0)
-                e = float(w["end"]) + (pad_after_ms/1000.0)
-                removes.append((max(0.0,s), max(e,0.0)))
-        return merge_intervals(removes)
+        texts = self.load_word_texts(words_path)
+        ids = np.asarray(word_ids_to_remove, dtype=np.int64)
+        ids = ids[(ids >= 0) & (ids < len(texts))]
+        starts, ends = self.load_word_spans(words_path, ids)
+        s = np.maximum(0.0, starts - pad_before_ms/1000.0)
+        e = np.maximum(0.0, ends + pad_after_ms/1000.0)
+        return merge_intervals(np.stack([s, e], axis=1))
+    
+    def _load_words(self, words_path: Path):
+        """Load (texts, timings) for a words file, reusing the previous load if it is unchanged"""
+        key = (words_path.resolve(), words_path.stat().st_mtime)
+        if key != self._words_key:
+            # prefer the .npz columns, unless the JSON was edited after they were written
+            npz_path = words_path.with_suffix('.npz')
+            if npz_path.exists() and npz_path.stat().st_mtime >= key[1]:
+                with np.load(npz_path) as data:
+                    # a list of str joins for the filler scan much faster than a <U> array
+                    self._words = data["text"].tolist(), (data["start"], data["end"])
+            else:
+                # keep the word dicts; timings are only read for the words that need them
+                words = read_json(words_path)
+                self._words = word_texts(words), words
+            self._words_key = key
+        return self._words
+    
+    def load_word_texts(self, words_path: Path) -> List[str]:
+        """Load the stripped text of every word"""
+        return self._load_words(words_path)[0]
+    
+    def load_word_spans(self, words_path: Path, ids) -> Tuple[np.ndarray, np.ndarray]:
+        """Load (starts, ends) arrays for the given word ids"""
+        timings = self._load_words(words_path)[1]
+        if isinstance(timings, tuple):
+            starts, ends = timings
+            return starts[ids], ends[ids]
+        starts = np.fromiter((timings[i]["start"] for i in ids), dtype=float, count=len(ids))
+        ends = np.fromiter((timings[i]["end"] for i in ids), dtype=float, count=len(ids))
+        return starts, ends
+    
+    def keep_ranges(self, video_path: Path, words_path: Path, removes) -> List[Tuple[float,float]]:
+        """Invert removes into keep ranges, probing the duration only when a cut may reach the end"""
+        texts = self.load_word_texts(words_path)
+        if len(removes) and texts:
+            _, last_end = self.load_word_spans(words_path, [len(texts) - 1])
+            if removes[-1][1] >= last_end[0]:
+                # the last cut covers the last word and may run past EOF, so bound it by the real
+                # duration; an open-ended keep there would start past the end of the file
+                return invert_intervals(removes, self.get_duration_seconds(video_path))
+        # otherwise leave the last keep open-ended and let ffmpeg play to the end of the file
+        return invert_intervals(removes, np.inf)
     
     def get_duration_seconds(self, video_path: Path) -> float:
         """Get video duration using ffprobe"""
@@ -280,43 +339,41 @@ class VideoTranscriber:
                 "-show_entries","format=duration","-of","default=nw=1:nk=1",
                 str(video_path)
             ]
-            out = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode().strip()
+            out = subprocess.check_output(cmd, stdin=subprocess.DEVNULL, stderr=subprocess.DEVNULL).decode().strip()
             return float(out)
         except Exception as e:
             print(f"Error getting duration: {e}")
             return 0.0
     
-    def render_cut_video(self, master: Path, keeps: List[Tuple[float,float]], out_path: Path):
+    def render_cut_video(self, master: Path, keeps: List[Tuple[float,float]], out_path: Path,
+                         accurate=False):
         """Cut and concatenate video using FFmpeg"""
         print("Cutting video segments...")
         
         try:
-            tempdir = tempfile.TemporaryDirectory()
-            parts = []
+            if accurate:
+                reencode_keeps(master, keeps, out_path, stderr=subprocess.DEVNULL)
+                return True
             
-            for i,(s,e) in enumerate(keeps):
-                part = Path(tempdir.name) / f"part_{i:03d}.mp4"
-                subprocess.check_call([
-                    "ffmpeg","-y","-v","error",
-                    "-ss", f"{s:.3f}",
-                    "-to", f"{e:.3f}",
-                    "-i", str(master),
-                    "-c","copy", str(part)
-                ], stderr=subprocess.DEVNULL)
-                parts.append(part)
+            tempdir = tempfile.TemporaryDirectory()
             
-            # write concat list
+            # write concat list: every entry points at the master with in/out points,
+            # so no intermediate segment files are written
             list_file = Path(tempdir.name) / "files.txt"
-            list_file.write_text("\n".join([f"file '{p.as_posix()}'" for p in parts]), encoding="utf-8")
+            list_file.write_text(concat_list(master, keeps), encoding="utf-8")
             
             # concat
-            subprocess.check_call([
-                "ffmpeg","-y","-v","error","-f","concat","-safe","0",
-                "-i", str(list_file),
-                "-c","copy", str(out_path)
-            ], stderr=subprocess.DEVNULL)
-            
-            tempdir.cleanup()
+            try:
+                run_ffmpeg([
+                    "-f","concat","-safe","0",
+                    "-i", str(list_file),
+                    "-c","copy", str(out_path)
+                ], stderr=subprocess.DEVNULL)
+            except subprocess.CalledProcessError:
+                print("Stream copy failed, re-encoding instead...")
+                reencode_keeps(master, keeps, out_path, stderr=subprocess.DEVNULL)
+            finally:
+                tempdir.cleanup()
             
         except Exception as e:
             print(f"Error cutting video: {e}")
@@ -331,8 +388,8 @@ class VideoTranscriber:
             return None
         
         # load words and detect fillers
-        words = json.loads(words_path.read_text(encoding="utf-8"))
-        filler_ids = detect_filler_word_ids(words)
+        texts = self.load_word_texts(words_path)
+        filler_ids = detect_filler_word_ids(texts, lambda ids: self.load_word_spans(words_path, ids))
         
         if not filler_ids:
             print("No filler words detected.")
@@ -341,12 +398,11 @@ class VideoTranscriber:
         print(f"Found {len(filler_ids)} filler words to remove")
         
         # Show which words will be removed
-        filler_words = [words[i]["word"] for i in filler_ids]
+        filler_words = [texts[i] for i in filler_ids]
         print(f"Removing: {', '.join(filler_words)}")
         
         removes = self.build_remove_intervals(words_path, filler_ids, pad_before_ms, pad_after_ms)
-        duration_s = self.get_duration_seconds(video_path)
-        keeps = invert_intervals(removes, duration_s)
+        keeps = self.keep_ranges(video_path, words_path, removes)
         
         if not keeps:
             print("Nothing to keep after cuts. Aborting.")
@@ -369,8 +425,7 @@ class VideoTranscriber:
             return None
             
         removes = self.build_remove_intervals(words_path, word_ids, pad_before_ms, pad_after_ms)
-        duration_s = self.get_duration_seconds(video_path)
-        keeps = invert_intervals(removes, duration_s)
+        keeps = self.keep_ranges(video_path, words_path, removes)
         
         if not keeps:
             print("Nothing to keep after cuts. Aborting.")
@@ -1,23 +1,47 @@
+import functools
+import itertools
 import os
 import sys
-import json
 import re
+import subprocess
+import tempfile
 from pathlib import Path
 from typing import List, Tuple
-from openai import OpenAI
-from moviepy.editor import VideoFileClip, concatenate_videoclips
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import ijson
+except ImportError:  # optional; without it show_words parses the whole file
+    ijson = None
 
+from video_utils import (
+    SMALL_INTERVALS, run_ffmpeg, extract_audio_mp3, read_json, write_json,
+    merge_intervals, invert_intervals, concat_list, reencode_keeps,
+)
+
+# merged on shared prefixes so each branch fails on its first characters
 FILLER_PATTERNS = [
-    r"\buh+\b", r"\bum+\b", r"\berm?\b", r"\ber+\b",
-    r"\blike\b", r"\bactually\b", r"\bbasically\b", r"\bliterally\b",
-    r"\byou know\b", r"\bi mean\b"
+    r"u(?:h+|m+)", r"er(?:m|r*)",
+    r"li(?:ke|terally)", r"actually", r"basically",
+    r"you know", r"i mean"
 ]
 
+_filler_re = re.compile(r"\b(?:" + "|".join(FILLER_PATTERNS) + r")\b", re.IGNORECASE)
+
+@functools.lru_cache(maxsize=8)
+def _load_words(path_str: str, mtime: float) -> List[dict]:
+    """Parse a words file once per (path, mtime); callers must not modify the result."""
+    return read_json(Path(path_str))
+
 class VideoEditor:
     def __init__(self):
+        self.client = None
+    
+    def _connect(self):
+        # only transcription talks to OpenAI, so the other commands skip these imports
+        from dotenv import load_dotenv
+        from openai import OpenAI
+        
+        load_dotenv()
         self.api_key = os.getenv('OPENAI_API_KEY')
         if not self.api_key:
             print("Error: OPENAI_API_KEY not found in .env file")
@@ -30,22 +54,19 @@ class VideoEditor:
             print(f"File not found: {video_path}")
             return
         
-        print(f"Transcribing: {video_path.name}")
+        if self.client is None:
+            self._connect()
         
-        audio_path = video_path.with_suffix('.temp.mp3')
-        video = VideoFileClip(str(video_path))
-        video.audio.write_audiofile(str(audio_path), verbose=False, logger=None)
-        video.close()
+        print(f"Transcribing: {video_path.name}")
         
-        with open(audio_path, "rb") as audio_file:
-            transcript = self.client.audio.transcriptions.create(
-                model="whisper-1",
-                file=audio_file,
-                response_format="verbose_json",
-                timestamp_granularities=["word"]
-            )
+        audio = extract_audio_mp3(video_path)
         
-        audio_path.unlink()
+        transcript = self.client.audio.transcriptions.create(
+            model="whisper-1",
+            file=audio,
+            response_format="verbose_json",
+            timestamp_granularities=["word"]
+        )
         
         words_data = []
         for word in transcript.words:
@@ -65,8 +86,7 @@ class VideoEditor:
         with open(transcript_file, 'w') as f:
             f.write(transcript.text)
         
-        with open(words_file, 'w') as f:
-            json.dump(words_data, f, indent=2)
+        write_json(words_file, words_data)
         
         print(f"Transcript saved: {transcript_file}")
         print(f"Words data saved: {words_file}")
@@ -74,11 +94,10 @@ class VideoEditor:
         return words_data
     
     def detect_fillers(self, words: List[dict]) -> List[int]:
-        filler_re = re.compile("|".join(FILLER_PATTERNS), re.IGNORECASE)
         ids = []
         for i, w in enumerate(words):
             txt = w["word"].strip()
-            if filler_re.fullmatch(txt):
+            if _filler_re.fullmatch(txt):
                 if txt.lower() == "like" and (w["end"] - w["start"]) > 0.35:
                     continue
                 ids.append(i)
@@ -86,35 +105,22 @@ class VideoEditor:
     
     def build_cuts(self, words: List[dict], word_ids: List[int], 
                    pad_before: float = 0.12, pad_after: float = 0.15) -> List[Tuple[float, float]]:
-        removes = []
-        for idx in word_ids:
-            if 0 <= idx < len(words):
-                w = words[idx]
-                start = max(0.0, w["start"] - pad_before)
-                end = w["end"] + pad_after
-                removes.append((start, end))
-        
-        removes = sorted(removes)
-        merged = []
-        for start, end in removes:
-            if merged and start <= merged[-1][1]:
-                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
-            else:
-                merged.append((start, end))
-        
-        duration = words[-1]["end"]
-        keeps = []
-        cursor = 0.0
-        for start, end in merged:
-            if start > cursor:
-                keeps.append((cursor, start))
-            cursor = max(cursor, end)
-        if cursor < duration:
-            keeps.append((cursor, duration))
-        
-        return [(s, e) for s, e in keeps if e - s > 0.01]
-    
-    def cut_video(self, video_path: str, keeps: List[Tuple[float, float]], output_name: str = None):
+        # only touch the requested words, so cost follows len(word_ids), not the transcript
+        ids = [idx for idx in word_ids if 0 <= idx < len(words)]
+        if len(ids) < SMALL_INTERVALS:
+            removes = [(max(0.0, words[idx]["start"] - pad_before), words[idx]["end"] + pad_after)
+                       for idx in ids]
+        else:
+            # imported here so short cut lists and the other commands run without numpy
+            import numpy as np
+            
+            starts = np.fromiter((words[idx]["start"] for idx in ids), dtype=float, count=len(ids))
+            ends = np.fromiter((words[idx]["end"] for idx in ids), dtype=float, count=len(ids))
+            removes = np.stack([np.maximum(0.0, starts - pad_before), ends + pad_after], axis=1)
+        return invert_intervals(merge_intervals(removes), words[-1]["end"])
+    
+    def cut_video(self, video_path: str, keeps: List[Tuple[float, float]], output_name: str = None,
+                  accurate: bool = False):
         video_path = Path(video_path)
         
         if output_name is None:
@@ -126,24 +132,31 @@ class VideoEditor:
         
         print(f"Cutting video into {len(keeps)} segments")
         
-        video = VideoFileClip(str(video_path))
-        clips = []
-        
-        for start, end in keeps:
-            clip = video.subclip(start, end)
-            clips.append(clip)
-        
-        final_video = concatenate_videoclips(clips)
-        final_video.write_videofile(str(output_path), verbose=False, logger=None)
-        
-        video.close()
-        final_video.close()
-        for clip in clips:
-            clip.close()
+        if accurate:
+            reencode_keeps(video_path, keeps, output_path)
+        else:
+            try:
+                self._cut_copy(video_path, keeps, output_path)
+            except subprocess.CalledProcessError:
+                # stream copy can only cut on keyframes; re-encode for frame-accurate cuts
+                print("Stream copy failed, re-encoding segments")
+                reencode_keeps(video_path, keeps, output_path)
         
         print(f"Saved: {output_path}")
         return str(output_path)
     
+    def _cut_copy(self, video_path: Path, keeps: List[Tuple[float, float]], output_path: Path):
+        # every concat entry reads straight from the source, so no segment files are written
+        with tempfile.TemporaryDirectory() as tempdir:
+            list_file = Path(tempdir) / "files.txt"
+            list_file.write_text(concat_list(video_path, keeps), encoding="utf-8")
+            
+            run_ffmpeg([
+                "-f", "concat", "-safe", "0",
+                "-i", str(list_file),
+                "-c", "copy", str(output_path)
+            ])
+    
     def remove_fillers(self, video_path: str):
         words_file = Path("output") / f"{Path(video_path).stem}_words.json"
         
@@ -151,7 +164,7 @@ class VideoEditor:
             print("No words file found. Run transcription first.")
             return
         
-        words = json.loads(words_file.read_text())
+        words = _load_words(str(words_file), words_file.stat().st_mtime)
         filler_ids = self.detect_fillers(words)
         
         if not filler_ids:
@@ -169,7 +182,7 @@ class VideoEditor:
             print("No words file found. Run transcription first.")
             return
         
-        words = json.loads(words_file.read_text())
+        words = _load_words(str(words_file), words_file.stat().st_mtime)
         print(f"Removing words: {word_ids}")
         
         keeps = self.build_cuts(words, word_ids)
@@ -182,11 +195,15 @@ class VideoEditor:
             print("No words file found. Run transcription first.")
             return
         
-        words = json.loads(words_file.read_text())
+        if ijson:
+            # only the first few words are shown, so don't parse the rest of the file
+            with words_file.open("rb") as f:
+                words = list(itertools.islice(ijson.items(f, "item", use_float=True), count))
+        else:
+            words = _load_words(str(words_file), words_file.stat().st_mtime)[:count]
         print(f"First {count} words (ID: word @ time):")
         
-        for i in range(min(count, len(words))):
-            w = words[i]
+        for i, w in enumerate(words):
             print(f"  {i:2d}: '{w['word']}' @ {w['start']:.1f}s")
 
 def main():
@@ -0,0 +1,131 @@
+"""
+Helpers shared by video_editor.py and transcribe_clean.py
+- JSON read/write (orjson when installed)
+- Remove/keep interval math
+- FFmpeg invocation, audio extraction and concat lists
+"""
+
+import io
+import json
+import math
+import subprocess
+from pathlib import Path
+from typing import List, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib parser
+    orjson = None
+
+# shared leading ffmpeg arguments: overwrite, quiet, never read from the terminal
+FFMPEG_ARGS = ("ffmpeg", "-y", "-v", "error", "-nostdin")
+
+def run_ffmpeg(args: List[str], **kwargs) -> subprocess.CompletedProcess:
+    """Run ffmpeg with the shared arguments, without inheriting stdin; raises on failure."""
+    return subprocess.run([*FFMPEG_ARGS, *args], stdin=subprocess.DEVNULL, check=True, **kwargs)
+
+def extract_audio_mp3(video_path: Path) -> io.BytesIO:
+    """Extract the first audio stream as 16kHz mono MP3 (what Whisper works with) into memory."""
+    result = run_ffmpeg([
+        "-i", str(video_path),
+        "-map", "0:a:0", "-f", "mp3", "-acodec", "libmp3lame", "-ar", "16000", "-ac", "1",
+        "pipe:1"
+    ], stdout=subprocess.PIPE)
+    
+    audio = io.BytesIO(result.stdout)
+    audio.name = "audio.mp3"  # the API infers the format from the file name
+    return audio
+
+def read_json(path: Path):
+    """Parse a JSON file, using orjson when it is installed."""
+    data = path.read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
+def write_json(path: Path, data) -> None:
+    """Write data as indented JSON, using orjson when it is installed."""
+    if orjson:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+# below this many intervals numpy's per-call overhead outweighs the loop it replaces
+SMALL_INTERVALS = 32
+
+def merge_intervals(intervals, merge_gap_s: float = 0.05) -> Union[List[Tuple[float, float]], "np.ndarray"]:
+    """Merge [start, end] intervals in seconds that overlap or lie within merge_gap_s.
+    
+    Returns sorted (start, end) pairs: a list for a handful of intervals, else an (N, 2) array.
+    """
+    if len(intervals) < SMALL_INTERVALS:
+        merged = []
+        for start, end in sorted(map(tuple, intervals), key=lambda iv: iv[0]):
+            # near-adjacent cuts (e.g. 'um, uh') fold into one instead of leaving a sliver
+            if merged and start <= merged[-1][1] + merge_gap_s:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return [(float(start), float(end)) for start, end in merged]
+    
+    # imported here so commands that never handle many intervals start without numpy
+    import numpy as np
+    
+    intervals = np.asarray(intervals, dtype=float).reshape(-1, 2)
+    order = np.argsort(intervals[:, 0], kind="stable")
+    starts, ends = intervals[order, 0], intervals[order, 1]
+    # a new group starts wherever a start lies merge_gap_s past every end seen so far
+    running_end = np.maximum.accumulate(ends)
+    first = np.flatnonzero(np.concatenate(([True], starts[1:] > running_end[:-1] + merge_gap_s)))
+    return np.stack([starts[first], np.maximum.reduceat(ends, first)], axis=1)
+
+def invert_intervals(removes, duration_s: float,
+                     min_keep_s: float = 0.01, min_cut_s: float = 0.04) -> List[Tuple[float, float]]:
+    """Return keep ranges by inverting merged, sorted removes over [0, duration]."""
+    if len(removes) < SMALL_INTERVALS:
+        removes = [(min(max(float(start), 0.0), duration_s), min(max(float(end), 0.0), duration_s))
+                   for start, end in removes]
+        # a cut shorter than min_cut_s costs more than it saves; keep its neighbours joined
+        removes = [(start, end) for start, end in removes if end - start >= min_cut_s]
+        keep_starts = [0.0] + [end for _, end in removes]
+        keep_ends = [start for start, _ in removes] + [duration_s]
+        # drop micro-keeps up front, which folds them into the removes on either side
+        return [(start, end) for start, end in zip(keep_starts, keep_ends) if end - start > min_keep_s]
+    
+    import numpy as np
+    
+    removes = np.clip(np.asarray(removes, dtype=float).reshape(-1, 2), 0.0, duration_s)
+    removes = removes[removes[:, 1] - removes[:, 0] >= min_cut_s]
+    # keeps run from each remove's end to the next remove's start
+    keep_starts = np.concatenate(([0.0], removes[:, 1]))
+    keep_ends = np.concatenate((removes[:, 0], [duration_s]))
+    mask = keep_ends - keep_starts > min_keep_s
+    return list(zip(keep_starts[mask].tolist(), keep_ends[mask].tolist()))
+
+def concat_list(master: Path, keeps: List[Tuple[float, float]]) -> str:
+    """Build an ffmpeg concat demuxer list that plays keep ranges straight from master."""
+    path = master.resolve().as_posix().replace("'", r"'\''")
+    lines = []
+    for start, end in keeps:
+        lines += [f"file '{path}'", f"inpoint {start:.3f}"]
+        if math.isfinite(end):
+            # an open-ended keep plays through to the end of the master
+            lines.append(f"outpoint {end:.3f}")
+    return "\n".join(lines) + "\n"
+
+def reencode_keeps(master: Path, keeps: List[Tuple[float, float]], out_path: Path, **kwargs) -> None:
+    """Cut keep ranges frame-accurately with trim/atrim + concat, re-encoding in one pass."""
+    filters = []
+    labels = []
+    for i, (start, end) in enumerate(keeps):
+        # an open-ended keep trims from its start to the end of the input
+        bounds = f"start={start:.3f}" + (f":end={end:.3f}" if math.isfinite(end) else "")
+        filters.append(f"[0:v]trim={bounds},setpts=PTS-STARTPTS[v{i}]")
+        filters.append(f"[0:a]atrim={bounds},asetpts=PTS-STARTPTS[a{i}]")
+        labels.append(f"[v{i}][a{i}]")
+    filters.append(f"{''.join(labels)}concat=n={len(keeps)}:v=1:a=1[v][a]")
+    
+    run_ffmpeg([
+        "-i", str(master),
+        "-filter_complex", ";".join(filters),
+        "-map", "[v]", "-map", "[a]",
+        str(out_path)
+    ], **kwargs)